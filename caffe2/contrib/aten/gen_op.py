@@ -277,10 +277,17 @@ if __name__ == '__main__':
             # e.g. "Float" is at::kFloat
             assert('Type' in o['method_of'])
 
-        static_tensor_inputs = sum(arg['type'] != 'TensorList' and value_is_tensor_type(arg) for arg in o['arguments'])
-        has_tensorlist = any(arg['type'] == 'TensorList' for arg in o['arguments'])
+        # count the tensor inputs and look for TensorList in a single pass
+        # rather than scanning o['arguments'] once per condition
+        static_tensor_inputs = 0
+        has_tensorlist = False
+        for arg in o['arguments']:
+            if arg['type'] == 'TensorList':
+                has_tensorlist = True
+            elif value_is_tensor_type(arg):
+                static_tensor_inputs += 1
         if has_tensorlist:
-            tensorlist_idx = [i for i, arg in enumerate(o['arguments']) if arg['type'] == 'TensorList'][0]
+            tensorlist_idx = next(i for i, arg in enumerate(o['arguments']) if arg['type'] == 'TensorList')
 
         real_inputs = 0
         for i, arg in enumerate(o['arguments']):
@@ -84,27 +84,35 @@ SKIP_PYTHON_BINDINGS = [
     '_fw_primal'
 ]
 
-# These function signatures are not exposed to Python. Note that this signature
-# list does not support regex.
-SKIP_PYTHON_BINDINGS_SIGNATURES = [
+# Compile the blocklist into a single anchored alternation once, instead of
+# recompiling every pattern for every native function.
+SKIP_PYTHON_BINDINGS_RE = re.compile('|'.join(f'(?:{p})' for p in SKIP_PYTHON_BINDINGS))
+
+# These function signatures are not exposed to Python. Note that this set
+# does not support regex.
+SKIP_PYTHON_BINDINGS_SIGNATURES = {
     'add(Tensor, Scalar, Scalar)', 'add_(Tensor, Scalar, Scalar)',
     'sub(Tensor, Scalar, Scalar)', 'sub_(Tensor, Scalar, Scalar)',
     'mul(Tensor, Scalar)', 'mul_(Tensor, Scalar)',
     'div(Tensor, Scalar)', 'div_(Tensor, Scalar)',
-]
+}
+
+# Base names appearing in SKIP_PYTHON_BINDINGS_SIGNATURES; checking this
+# first lets the common case skip reconstructing the full signature string.
+SKIP_PYTHON_BINDINGS_SIGNATURES_NAMES = \
+    frozenset(s.split('(', 1)[0] for s in SKIP_PYTHON_BINDINGS_SIGNATURES)
 
 @with_native_function
 def should_generate_py_binding(f: NativeFunction) -> bool:
     name = cpp.name(f.func)
-    for pattern in SKIP_PYTHON_BINDINGS:
-        if re.match('^' + pattern + '$', name):
-            return False
-
-    args = ', '.join(argument_type_str(arg.type)
-                     for arg in signature(f).arguments())
-    sig = f'{name}({args})'
-    for pattern in SKIP_PYTHON_BINDINGS_SIGNATURES:
-        if pattern == sig:
+    if SKIP_PYTHON_BINDINGS_RE.fullmatch(name):
+        return False
+
+    if name in SKIP_PYTHON_BINDINGS_SIGNATURES_NAMES:
+        args = ', '.join(argument_type_str(arg.type)
+                         for arg in signature(f).arguments())
+        sig = f'{name}({args})'
+        if sig in SKIP_PYTHON_BINDINGS_SIGNATURES:
             return False
 
     return True
@@ -175,8 +183,7 @@ def create_python_bindings(
         if pred(pair.function):
             grouped[pair.function.func.name.name].append(pair)
 
-    for name in sorted(grouped.keys(), key=lambda x: str(x)):
-        overloads = grouped[name]
+    for name, overloads in sorted(grouped.items(), key=lambda kv: str(kv[0])):
         py_methods.append(method_impl(name, module, overloads, method=method))
         py_method_defs.append(method_def(name, module, overloads, method=method))
         py_forwards.extend(forward_decls(name, overloads, method=method))
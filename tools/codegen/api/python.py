@@ -652,6 +652,22 @@ def argument(a: Argument) -> PythonArgument:
         default_init=None,
     )
 
+# The trailing 'pin_memory' and 'requires_grad' arguments are identical for
+# every factory/like signature; construct them once and share the instances
+# (PythonArgument is frozen, so this is safe).
+_PIN_MEMORY_ARG = PythonArgument(
+    name='pin_memory',
+    type=BaseType(BaseTy.bool),
+    default='False',
+    default_init=None,
+)
+_REQUIRES_GRAD_ARG = PythonArgument(
+    name='requires_grad',
+    type=BaseType(BaseTy.bool),
+    default='False',
+    default_init=None,
+)
+
 # Generates a PythonSignature that can be used for either .pyi or PythonArgParser codegen
 def signature(f: NativeFunction, *, method: bool = False, pyi: bool = False) -> PythonSignature:
     args: List[Argument] = []
@@ -670,9 +686,21 @@ def signature(f: NativeFunction, *, method: bool = False, pyi: bool = False) ->
     kwarg_only_set = set(a.name for a in f.func.arguments.flat_kwarg_only)
     out_arg_set = set(a.name for a in f.func.arguments.out)
 
-    input_args = tuple(map(argument, filter(lambda a: a.name in input_arg_set, args)))
-    input_kwargs = tuple(map(argument, filter(lambda a: a.name in kwarg_only_set, args)))
-    outputs = tuple(map(argument, filter(lambda a: a.name in out_arg_set, args)))
+    # The three sets above are disjoint, so a single pass over args can
+    # route each argument to the right bucket.
+    input_args_list: List[PythonArgument] = []
+    input_kwargs_list: List[PythonArgument] = []
+    outputs_list: List[PythonArgument] = []
+    for a in args:
+        if a.name in input_arg_set:
+            input_args_list.append(argument(a))
+        elif a.name in kwarg_only_set:
+            input_kwargs_list.append(argument(a))
+        elif a.name in out_arg_set:
+            outputs_list.append(argument(a))
+    input_args = tuple(input_args_list)
+    input_kwargs = tuple(input_kwargs_list)
+    outputs = tuple(outputs_list)
 
     # Reintroduce the scattered fields of TensorOptions for Python.
     # Compared to the cpp counterpart, the python arguments have new property
@@ -714,18 +742,8 @@ def signature(f: NativeFunction, *, method: bool = False, pyi: bool = False) ->
             default='None',
             default_init='self.device()' if is_like_or_new_function else None,
         ))
-        tensor_options_args.append(PythonArgument(
-            name='pin_memory',
-            type=BaseType(BaseTy.bool),
-            default='False',
-            default_init=None,
-        ))
-        tensor_options_args.append(PythonArgument(
-            name='requires_grad',
-            type=BaseType(BaseTy.bool),
-            default='False',
-            default_init=None,
-        ))
+        tensor_options_args.append(_PIN_MEMORY_ARG)
+        tensor_options_args.append(_REQUIRES_GRAD_ARG)
 
     returns = PythonReturns(returns=f.func.returns)
 
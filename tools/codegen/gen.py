@@ -81,6 +81,10 @@ class LineLoader(Loader):
         return mapping
 
 # Parse native_functions.yaml into a sequence of NativeFunctions
+# Cached: the autograd/python-binding/pyi generators all re-parse the same
+# native_functions.yaml.  Callers must not mutate the returned list (they
+# already copy via filter/sorted).
+@functools.lru_cache(maxsize=None)
 def parse_native_yaml(path: str) -> List[NativeFunction]:
     with open(path, 'r') as f:
         es = yaml.load(f, Loader=LineLoader)
@@ -1,4 +1,5 @@
 import re
+import functools
 
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Iterator, Tuple, Set, NoReturn, Sequence, Callable, Union
@@ -11,6 +12,15 @@ import itertools
 def assert_never(x: NoReturn) -> NoReturn:
     raise AssertionError("Unhandled type: {}".format(type(x).__name__))
 
+# Pre-compiled patterns for the parsers below.  These run for every
+# argument/return of every schema, so don't go through re's per-call
+# cache lookup each time.
+_ANNOTATION_RE = re.compile(r'^([a-z])(!?)$')
+_OPTIONAL_TYPE_RE = re.compile(r'^(.+)\?$')
+_LIST_TYPE_RE = re.compile(r'^(.+)\[([0-9]+)?\]$')
+_TENSOR_ANNOTATED_TYPE_RE = re.compile(r'Tensor\((.+)\)(.*)')
+_DUNDER_NAME_RE = re.compile(r'^__([^_]+)__$')
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
 #
 #                           DATA MODEL
@@ -608,8 +618,9 @@ class Annotation:
     is_write: bool
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def parse(ann: str) -> 'Annotation':
-        m = re.match(r'^([a-z])(!?)$', ann)
+        m = _ANNOTATION_RE.match(ann)
         assert m is not None, f'unrecognized alias annotation {ann}'
         alias_set = (m.group(1),)
         is_write = m.group(2) == '!'
@@ -630,7 +641,10 @@ class Annotation:
 # of the subclasses.  If Python had ADTs this would be one!
 @dataclass(frozen=True)
 class Type:
+    # Parsing is pure and the same type strings recur across thousands of
+    # schemas, so memoize.  Types are frozen, so sharing instances is safe.
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def parse(t: str) -> 'Type':
         r = Type._parse(t)
         assert str(r) == t, f'{r} != {t}'
@@ -638,10 +652,10 @@ class Type:
 
     @staticmethod
     def _parse(t: str) -> 'Type':
-        m = re.match(r'^(.+)\?$', t)
+        m = _OPTIONAL_TYPE_RE.match(t)
         if m is not None:
             return OptionalType(Type.parse(m.group(1)))
-        m = re.match(r'^(.+)\[([0-9]+)?\]$', t)
+        m = _LIST_TYPE_RE.match(t)
         if m is not None:
             size = int(m.group(2)) if m.group(2) is not None else None
             return ListType(elem=Type.parse(m.group(1)), size=size)
@@ -786,7 +800,7 @@ class Argument:
             name = name_and_default
             default = None
         # TODO: deduplicate annotation matching with Return
-        match = re.match(r'Tensor\((.+)\)(.*)', type_and_annot)
+        match = _TENSOR_ANNOTATED_TYPE_RE.match(type_and_annot)
         annotation: Optional[Annotation]
         if match:
             # If you update this, make sure the __str__ still works too
@@ -838,7 +852,7 @@ class Return:
         else:
             type_and_annot = arg
             name = None
-        match = re.match(r'Tensor\((.+)\)(.*)', type_and_annot)
+        match = _TENSOR_ANNOTATED_TYPE_RE.match(type_and_annot)
         annotation: Optional[Annotation]
         if match:
             # If you update this, make sure the __str__ still works too
@@ -1142,7 +1156,7 @@ class BaseOperatorName:
         assert not op.endswith('_out'), \
             "_out suffix is reserved and not permitted for operator names; " \
             "did you mean to specify an out overload name instead?"
-        m = re.match(r'^__([^_]+)__$', op)
+        m = _DUNDER_NAME_RE.match(op)
         if m is not None:
             dunder_method = True
             base = m.group(1)
@@ -22,6 +22,7 @@ import argparse
 import re
 from itertools import groupby
 from functools import reduce
+from operator import itemgetter
 from ..autograd.gen_autograd import load_aten_declarations
 from ..autograd.gen_autograd import RETURNS_VIEWS_OF_INPUT
 from ..autograd.utils import CodeTemplate, write, is_out_variant, op_name_with_overload
@@ -323,10 +324,12 @@ def gen_unboxing_wrappers(
                 return_type = decl['returns'][0]['type']
             else:
                 return_type = "std::tuple<{}>".format(", ".join([r['type'] for r in decl['returns']]))
-            for a in decl['arguments']:
-                if 'type' not in a:
-                    raise Exception(decl)
-            argument_types_with_leading_comma = ", ".join([a['type'] for a in decl['arguments']])
+            try:
+                # itemgetter does the per-argument key lookup at C level
+                argument_types = list(map(itemgetter('type'), decl['arguments']))
+            except KeyError:
+                raise Exception(decl)
+            argument_types_with_leading_comma = ", ".join(argument_types)
             if argument_types_with_leading_comma != "":
                 argument_types_with_leading_comma = ", " + argument_types_with_leading_comma
             args_with_leading_comma = pack_arguments(args)
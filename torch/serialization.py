@@ -1,14 +1,14 @@
+import bisect
 import difflib
 import os
 import io
-import shutil
 import struct
 import sys
 import torch
 import tarfile
 import tempfile
 import warnings
-from contextlib import closing, contextmanager
+from contextlib import closing
 from ._utils import _import_dotted_name
 from ._six import string_classes as _string_classes
 from torch._utils_internal import get_source_lines_and_file
@@ -32,15 +32,16 @@ class SourceChangeWarning(Warning):
     pass
 
 
-@contextmanager
-def mkdtemp():
-    path = tempfile.mkdtemp()
-    yield path
-    shutil.rmtree(path)
-
-
 _package_registry = []
 
+# Memoized registry lookups: the tagger that claimed a storage type, and the
+# deserializer that claimed a (storage type, location) pair.  location_tag and
+# default_restore_location run once per storage, so for large state_dicts this
+# avoids re-scanning the registry thousands of times.  register_package
+# invalidates both caches.
+_storage_tagger_cache: Dict[Any, Any] = {}
+_storage_deserializer_cache: Dict[Any, Any] = {}
+
 
 def _is_zipfile(f) -> bool:
     # This is a stricter implementation than zipfile.is_zipfile().
@@ -50,26 +51,22 @@ def _is_zipfile(f) -> bool:
     # collisions and assume the zip has only 1 file.
     # See bugs.python.org/issue28494.
 
-    # Read the first 4 bytes of the file
-    read_bytes = []
     start = f.tell()
-
-    byte = f.read(1)
-    while byte != "":
-        read_bytes.append(byte)
-        if len(read_bytes) == 4:
-            break
-        byte = f.read(1)
+    # Read the first 4 bytes of the file
+    local_header_magic_number = b'PK\x03\x04'
+    read_bytes = f.read(len(local_header_magic_number))
     f.seek(start)
 
-    local_header_magic_number = [b'P', b'K', b'\x03', b'\x04']
     return read_bytes == local_header_magic_number
 
 
 def register_package(priority, tagger, deserializer):
     queue_elem = (priority, tagger, deserializer)
-    _package_registry.append(queue_elem)
-    _package_registry.sort()
+    # the registry is kept sorted by priority; insort keeps registration
+    # linear instead of re-sorting the whole list each time
+    bisect.insort(_package_registry, queue_elem)
+    _storage_tagger_cache.clear()
+    _storage_deserializer_cache.clear()
 
 
 def check_module_version_greater_or_equal(module, req_version_tuple, error_if_malformed=True):
@@ -162,18 +159,31 @@ register_package(20, _cuda_tag, _cuda_deserialize)
 
 
 def location_tag(storage: Storage):
+    cached_tagger = _storage_tagger_cache.get(type(storage))
+    if cached_tagger is not None:
+        location = cached_tagger(storage)
+        if location:
+            return location
     for _, tagger, _ in _package_registry:
         location = tagger(storage)
         if location:
+            _storage_tagger_cache[type(storage)] = tagger
             return location
     raise RuntimeError("don't know how to determine data location of "
                        + torch.typename(storage))
 
 
 def default_restore_location(storage, location):
+    cache_key = (type(storage), location)
+    cached_fn = _storage_deserializer_cache.get(cache_key)
+    if cached_fn is not None:
+        result = cached_fn(storage, location)
+        if result is not None:
+            return result
     for _, _, fn in _package_registry:
         result = fn(storage, location)
         if result is not None:
+            _storage_deserializer_cache[cache_key] = fn
             return result
     raise RuntimeError("don't know how to restore data location of "
                        + torch.typename(storage) + " (tagged with "
@@ -191,8 +201,7 @@ def storage_to_tensor_type(storage):
 
 
 def _is_path(name_or_buffer):
-    return isinstance(name_or_buffer, str) or \
-        (sys.version_info[0] == 3 and isinstance(name_or_buffer, pathlib.Path))
+    return isinstance(name_or_buffer, (str, pathlib.Path))
 
 
 class _opener(object):
@@ -400,20 +409,15 @@ def _legacy_save(obj, f, pickle_module, pickle_protocol) -> None:
             return ('module', obj, source_file, source)
 
         elif torch.is_storage(obj):
-            view_metadata: Optional[Tuple[str, int, int]]
             obj = cast(Storage, obj)
             storage_type = normalize_storage_type(type(obj))
-            # Offset is always 0, but we keep it for backwards compatibility
-            # with the old serialization format (which supported storage views)
-            offset = 0
             obj_key = str(obj._cdata)
             location = location_tag(obj)
             serialized_storages[obj_key] = obj
-            is_view = obj._cdata != obj._cdata
-            if is_view:
-                view_metadata = (str(obj._cdata), offset, obj.size())
-            else:
-                view_metadata = None
+            # view_metadata is always None; we keep the slot for backwards
+            # compatibility with the old serialization format (which supported
+            # storage views)
+            view_metadata = None
 
             return ('storage',
                     storage_type,
@@ -440,11 +444,13 @@ def _legacy_save(obj, f, pickle_module, pickle_protocol) -> None:
     pickler.persistent_id = persistent_id
     pickler.dump(obj)
 
-    serialized_storage_keys = sorted(serialized_storages.keys())
+    # The keys are stringified pointers, so sorting them is meaningless;
+    # the loader only needs the pickled key list to match the write order.
+    serialized_storage_keys = list(serialized_storages)
     pickle_module.dump(serialized_storage_keys, f, protocol=pickle_protocol)
     f.flush()
-    for key in serialized_storage_keys:
-        serialized_storages[key]._write_file(f, _should_read_directly(f), True)
+    for storage in serialized_storages.values():
+        storage._write_file(f, _should_read_directly(f), True)
 
 
 def _save(obj, zip_file, pickle_module, pickle_protocol):
@@ -477,10 +483,11 @@ def _save(obj, zip_file, pickle_module, pickle_protocol):
     data_value = data_buf.getvalue()
     zip_file.write_record('data.pkl', data_value, len(data_value))
 
-    # Write each tensor to a file named tensor/the_tensor_key in the zip archive
-    for key in sorted(serialized_storages.keys()):
+    # Write each tensor to a file named tensor/the_tensor_key in the zip
+    # archive.  Insertion order is deterministic for a given object graph and
+    # the keys are stringified pointers, so there is no reason to sort them.
+    for key, storage in serialized_storages.items():
         name = f'data/{key}'
-        storage = serialized_storages[key]
         # given that we copy things around anyway, we might use storage.cpu()
         # this means to that to get tensors serialized, you need to implement
         # .cpu() on the underlying Storage
@@ -610,6 +617,21 @@ _get_layout.cache = {}   # type: ignore[attr-defined]
 copyreg.pickle(torch.layout, lambda obj: (_get_layout, (str(obj),)))
 
 
+# Pre-compiled header layouts for the legacy tar format, so the format
+# strings aren't re-parsed for every tensor.  The per-ndim struct covers
+# size, stride and storage_offset and is cached lazily by rank.
+_LEGACY_TAR_NDIM_STRUCT = struct.Struct('<ii')
+_legacy_tar_header_structs: Dict[int, struct.Struct] = {}
+
+
+def _legacy_tar_header_struct(ndim: int) -> struct.Struct:
+    s = _legacy_tar_header_structs.get(ndim)
+    if s is None:
+        s = struct.Struct(f'<{ndim}q{ndim}qq')
+        _legacy_tar_header_structs[ndim] = s
+    return s
+
+
 def _legacy_load(f, map_location, pickle_module, **pickle_load_args):
     deserialized_objects: Dict[int, Any] = {}
 
@@ -666,38 +688,50 @@ def _legacy_load(f, map_location, pickle_module, **pickle_load_args):
                 return saved_id[0]
             return deserialized_objects[int(saved_id)]
 
-        with closing(tarfile.open(fileobj=f, mode='r:', format=tarfile.PAX_FORMAT)) as tar, \
-                mkdtemp() as tmpdir:
+        # bind the bound method once; it is otherwise re-resolved for every
+        # storage and tensor entry below
+        pickle_load = pickle_module.load
 
-            tar.extract('storages', path=tmpdir)
+        with closing(tarfile.open(fileobj=f, mode='r:', format=tarfile.PAX_FORMAT)) as tar, \
+                tempfile.TemporaryDirectory() as tmpdir:
+
+            # Extract both members in a single pass over the archive instead
+            # of scanning it once per member.  They have to go through the
+            # filesystem (rather than tar.extractfile) because _new_with_file
+            # needs a real file descriptor.
+            tar.extractall(path=tmpdir,
+                           members=(m for m in tar if m.name in ('storages', 'tensors')))
             with open(os.path.join(tmpdir, 'storages'), 'rb', 0) as f:
-                num_storages = pickle_module.load(f, **pickle_load_args)
+                num_storages = pickle_load(f, **pickle_load_args)
                 for i in range(num_storages):
-                    args = pickle_module.load(f, **pickle_load_args)
+                    args = pickle_load(f, **pickle_load_args)
                     key, location, storage_type = args
                     obj = storage_type._new_with_file(f)
                     obj = restore_location(obj, location)
                     deserialized_objects[key] = obj
 
-                storage_views = pickle_module.load(f, **pickle_load_args)
+                storage_views = pickle_load(f, **pickle_load_args)
                 for target_cdata, root_cdata, offset, size in storage_views:
                     root = deserialized_objects[root_cdata]
                     deserialized_objects[target_cdata] = root[offset:offset + size]
 
-            tar.extract('tensors', path=tmpdir)
             with open(os.path.join(tmpdir, 'tensors'), 'rb', 0) as f:
-                num_tensors = pickle_module.load(f, **pickle_load_args)
+                num_tensors = pickle_load(f, **pickle_load_args)
                 for _ in range(num_tensors):
-                    args = pickle_module.load(f, **pickle_load_args)
+                    args = pickle_load(f, **pickle_load_args)
                     key, storage_id, original_tensor_type = args
                     storage = deserialized_objects[storage_id]
                     tensor_type = storage_to_tensor_type(storage)
-                    ndim, = struct.unpack('<i', f.read(4))
-                    # skip next 4 bytes; legacy encoding treated ndim as 8 bytes
-                    f.read(4)
-                    size = struct.unpack(f'<{ndim}q', f.read(8 * ndim))
-                    stride = struct.unpack(f'<{ndim}q', f.read(8 * ndim))
-                    storage_offset, = struct.unpack('<q', f.read(8))
+                    # legacy encoding treated ndim as 8 bytes; the high 4 bytes
+                    # are always zero and are dropped here
+                    ndim, _ = _LEGACY_TAR_NDIM_STRUCT.unpack(f.read(8))
+                    # read size, stride and storage_offset in one shot rather
+                    # than one read/unpack round-trip per field
+                    header_struct = _legacy_tar_header_struct(ndim)
+                    vals = header_struct.unpack(f.read(header_struct.size))
+                    size = vals[:ndim]
+                    stride = vals[ndim:2 * ndim]
+                    storage_offset = vals[2 * ndim]
                     tensor = tensor_type().set_(storage, storage_offset, size, stride)
                     deserialized_objects[key] = tensor
 
@@ -720,20 +754,24 @@ def _legacy_load(f, map_location, pickle_module, **pickle_load_args):
                 _check_container_source(*data)
             return data[0]
         elif typename == 'storage':
-            data_type, root_key, location, size, view_metadata = data
+            # Anything we write today puts None in the view_metadata slot, so
+            # also accept tuples that drop it entirely.
+            data_type, root_key, location, size = data[:4]
+            view_metadata = data[4] if len(data) > 4 else None
             location = _maybe_decode_ascii(location)
             if root_key not in deserialized_objects:
                 obj = data_type(size)
                 obj._torch_load_uninitialized = True
                 deserialized_objects[root_key] = restore_location(obj, location)
             storage = deserialized_objects[root_key]
-            if view_metadata is not None:
-                view_key, offset, view_size = view_metadata
-                if view_key not in deserialized_objects:
-                    deserialized_objects[view_key] = storage[offset:offset + view_size]
-                return deserialized_objects[view_key]
-            else:
+            if view_metadata is None:
                 return storage
+            # Storage views only appear in files written by very old versions
+            # of torch.
+            view_key, offset, view_size = view_metadata
+            if view_key not in deserialized_objects:
+                deserialized_objects[view_key] = storage[offset:offset + view_size]
+            return deserialized_objects[view_key]
         else:
             raise RuntimeError("Unknown saved id type: %s" % saved_id[0])
 